@@ -1,11 +1,15 @@
+import asyncio
 import hashlib
 import inspect
 from functools import wraps
-from typing import Any, Optional, Union, Callable
+from typing import Any, Dict, Optional, Tuple, Union, Callable
 from datetime import timedelta
 from .base import BaseCache
 from ..utils.logger import logger
 
+# 進行中的計算: {(快取實例ID, 快取鍵): Future}，同一鍵的並發調用共用結果
+_inflight: Dict[Tuple[int, str], asyncio.Future] = {}
+
 def cache(
     expire: Optional[Union[int, timedelta]] = None,
     key_prefix: str = "",
@@ -32,24 +36,51 @@ def cache(
                 kwargs
             )
             
-            # 嘗試獲取快取
-            cached_value = await cache_instance.get(cache_key)
-            if cached_value is not None:
-                logger.debug(f"快取命中: {cache_key}")
-                return cached_value
-            
-            # 執行原函數
-            result = await func(self, *args, **kwargs)
+            inflight_key = (id(cache_instance), cache_key)
+            while True:
+                # 嘗試獲取快取
+                cached_value = await cache_instance.get(cache_key)
+                if cached_value is not None:
+                    logger.debug("快取命中: %s", cache_key)
+                    return cached_value
+                
+                # 相同鍵已在計算中，等待其結果
+                pending = _inflight.get(inflight_key)
+                if pending is None:
+                    break
+                try:
+                    return await asyncio.shield(pending)
+                except asyncio.CancelledError:
+                    # 本調用被取消時向上拋出；
+                    # 若是領頭調用被取消，重新檢查快取或自行計算
+                    if not pending.cancelled():
+                        raise
             
-            # 如果結果為 None 且不快取空值，則直接返回
-            if result is None and not cache_null:
+            future = asyncio.get_running_loop().create_future()
+            _inflight[inflight_key] = future
+            try:
+                # 執行原函數
+                result = await func(self, *args, **kwargs)
+                
+                # 結果為 None 且不快取空值時不寫入快取
+                if result is not None or cache_null:
+                    await cache_instance.set(cache_key, result, expire)
+                    logger.debug("設置快取: %s", cache_key)
+                
+                future.set_result(result)
                 return result
-            
-            # 設置快取
-            await cache_instance.set(cache_key, result, expire)
-            logger.debug(f"設置快取: {cache_key}")
-            
-            return result
+                
+            except asyncio.CancelledError:
+                # 通知等待者重試，而非將取消傳遞給它們
+                future.cancel()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                # 標記異常已處理，避免無等待者時的警告
+                future.exception()
+                raise
+            finally:
+                del _inflight[inflight_key]
         
         @wraps(func)
         def sync_wrapper(
@@ -73,7 +104,7 @@ def cache(
             import asyncio
             cached_value = asyncio.run(cache_instance.get(cache_key))
             if cached_value is not None:
-                logger.debug(f"快取命中: {cache_key}")
+                logger.debug("快取命中: %s", cache_key)
                 return cached_value
             
             # 執行原函數
@@ -85,7 +116,7 @@ def cache(
             
             # 設置快取 (同步方式)
             asyncio.run(cache_instance.set(cache_key, result, expire))
-            logger.debug(f"設置快取: {cache_key}")
+            logger.debug("設置快取: %s", cache_key)
             
             return result
         
@@ -1,8 +1,8 @@
 from typing import Optional, Dict, Type
 from enum import Enum
 from .base import BaseCache
-from .memory import MemoryCache
-from .redis import RedisCache
+from .memory import DEFAULT_MAX_SIZE, MemoryCache
+from .redis import RedisCache, close_pools
 from ..utils.logger import logger
 
 class CacheType(str, Enum):
@@ -40,9 +40,10 @@ class CacheManager:
         **kwargs
     ) -> BaseCache:
         """創建快取實例"""
+        max_size = kwargs.get("max_size", DEFAULT_MAX_SIZE)
         try:
             if cache_type == CacheType.MEMORY:
-                return MemoryCache()
+                return MemoryCache(max_size=max_size)
             elif cache_type == CacheType.REDIS:
                 redis_url = kwargs.get("redis_url")
                 if not redis_url:
@@ -52,9 +53,9 @@ class CacheManager:
                 raise ValueError(f"不支持的快取類型: {cache_type}")
                 
         except Exception as e:
-            logger.error(f"創建快取實例失敗: {str(e)}")
+            logger.error("創建快取實例失敗: %s", e)
             # 如果創建失敗，返回記憶體快取作為後備
-            return MemoryCache()
+            return MemoryCache(max_size=max_size)
     
     async def clear_all(self):
         """清空所有快取"""
@@ -67,6 +68,7 @@ class CacheManager:
             if hasattr(cache, 'close'):
                 await cache.close()
         self._caches.clear()
+        await close_pools()
 
 # 創建全局快取管理器實例
 cache_manager = CacheManager() 
\ No newline at end of file
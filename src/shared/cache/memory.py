@@ -1,27 +1,56 @@
 import time
-from typing import Any, Dict, Optional, Union
+from collections import OrderedDict
+from typing import Any, Optional, Union
 from datetime import timedelta
 from .base import BaseCache
 
+# 默認容量上限，避免長時間運行時無限增長
+DEFAULT_MAX_SIZE = 10_000
+
 class MemoryCache(BaseCache):
     """記憶體快取"""
     
-    def __init__(self):
+    def __init__(self, max_size: Optional[int] = DEFAULT_MAX_SIZE):
         super().__init__()
-        self._cache: Dict[str, tuple] = {}  # {key: (value, expire_time)}
+        self.max_size = max_size
+        # {key: (value, expire_time)}，按最近訪問順序排列
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+    
+    def _get_entry(self, key: str) -> Optional[tuple]:
+        """獲取未過期的快取項目（鍵名已格式化）"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+            
+        _, expire_time = entry
+        if expire_time and time.time() > expire_time:
+            del self._cache[key]
+            return None
+            
+        self._cache.move_to_end(key)
+        return entry
+    
+    def _purge_expired_head(self):
+        """從最久未使用端移除連續的過期項目"""
+        now = time.time()
+        while self._cache:
+            _, expire_time = next(iter(self._cache.values()))
+            if not expire_time or expire_time > now:
+                break
+            self._cache.popitem(last=False)
     
     async def get(self, key: str) -> Optional[Any]:
         """獲取快取"""
         try:
-            key = self._format_key(key)
-            if not await self.exists(key):
+            entry = self._get_entry(self._format_key(key))
+            if entry is None:
                 return None
                 
-            value, expire_time = self._cache[key]
+            value, expire_time = entry
             return value
             
         except Exception as e:
-            self.logger.error(f"獲取快取失敗: {str(e)}")
+            self.logger.error("獲取快取失敗: %s", e)
             return None
     
     async def set(
@@ -40,10 +69,18 @@ class MemoryCache(BaseCache):
                 expire_time = time.time() + expire_seconds
                 
             self._cache[key] = (value, expire_time)
+            self._cache.move_to_end(key)
+            
+            # 移除最久未使用端已過期的項目（不再被讀取的鍵也會釋放）
+            self._purge_expired_head()
+            
+            # 超過容量時淘汰最久未使用的項目
+            if self.max_size and len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
             return True
             
         except Exception as e:
-            self.logger.error(f"設置快取失敗: {str(e)}")
+            self.logger.error("設置快取失敗: %s", e)
             return False
     
     async def delete(self, key: str) -> bool:
@@ -55,25 +92,16 @@ class MemoryCache(BaseCache):
             return True
             
         except Exception as e:
-            self.logger.error(f"刪除快取失敗: {str(e)}")
+            self.logger.error("刪除快取失敗: %s", e)
             return False
     
     async def exists(self, key: str) -> bool:
         """檢查快取是否存在"""
         try:
-            key = self._format_key(key)
-            if key not in self._cache:
-                return False
-                
-            _, expire_time = self._cache[key]
-            if expire_time and time.time() > expire_time:
-                await self.delete(key)
-                return False
-                
-            return True
+            return self._get_entry(self._format_key(key)) is not None
             
         except Exception as e:
-            self.logger.error(f"檢查快取失敗: {str(e)}")
+            self.logger.error("檢查快取失敗: %s", e)
             return False
     
     async def clear(self) -> bool:
@@ -83,5 +111,5 @@ class MemoryCache(BaseCache):
             return True
             
         except Exception as e:
-            self.logger.error(f"清空快取失敗: {str(e)}")
-            return False 
\ No newline at end of file
+            self.logger.error("清空快取失敗: %s", e)
+            return False
@@ -1,15 +1,57 @@
-import json
-from typing import Any, Optional, Union
+import asyncio
+import weakref
+from typing import Any, Dict, Optional, Tuple, Union
 from datetime import timedelta
-import aioredis
+from redis import asyncio as aioredis
 from .base import BaseCache
+from ..utils.helpers import json_dumps, json_loads
+
+# 連接池: {事件循環: {(redis_url, max_connections): ConnectionPool}}
+# 連接綁定於創建它的事件循環，因此按循環分開共用；循環回收後連同移除
+_LoopPools = Dict[Tuple[str, int], aioredis.ConnectionPool]
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopPools]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def _get_pool(redis_url: str, max_connections: int) -> aioredis.ConnectionPool:
+    """獲取當前事件循環的共用連接池"""
+    pools = _pools.setdefault(asyncio.get_running_loop(), {})
+    key = (redis_url, max_connections)
+    pool = pools.get(key)
+    if pool is None:
+        pool = aioredis.ConnectionPool.from_url(
+            redis_url,
+            max_connections=max_connections
+        )
+        pools[key] = pool
+    return pool
+
+async def close_pools():
+    """斷開當前事件循環的所有共用連接池"""
+    pools = _pools.pop(asyncio.get_running_loop(), {})
+    for pool in pools.values():
+        await pool.disconnect()
 
 class RedisCache(BaseCache):
     """Redis 快取"""
     
-    def __init__(self, redis_url: str):
+    def __init__(self, redis_url: str, max_connections: int = 32):
         super().__init__()
-        self.redis = aioredis.from_url(redis_url)
+        self.redis_url = redis_url
+        self.max_connections = max_connections
+        self._redis: Optional[aioredis.Redis] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    @property
+    def redis(self) -> aioredis.Redis:
+        """當前事件循環的客戶端"""
+        loop = asyncio.get_running_loop()
+        if self._redis is None or self._loop is not loop:
+            self._redis = aioredis.Redis(
+                connection_pool=_get_pool(self.redis_url, self.max_connections)
+            )
+            self._loop = loop
+        return self._redis
     
     async def get(self, key: str) -> Optional[Any]:
         """獲取快取"""
@@ -20,10 +62,10 @@ class RedisCache(BaseCache):
             if value is None:
                 return None
                 
-            return json.loads(value)
+            return json_loads(value)
             
         except Exception as e:
-            self.logger.error(f"獲取 Redis 快取失敗: {str(e)}")
+            self.logger.error("獲取 Redis 快取失敗: %s", e)
             return None
     
     async def set(
@@ -35,7 +77,7 @@ class RedisCache(BaseCache):
         """設置快取"""
         try:
             key = self._format_key(key)
-            value = json.dumps(value)
+            value = json_dumps(value)
             
             if expire:
                 expire_seconds = self._get_expire_seconds(expire)
@@ -46,7 +88,7 @@ class RedisCache(BaseCache):
             return True
             
         except Exception as e:
-            self.logger.error(f"設置 Redis 快取失敗: {str(e)}")
+            self.logger.error("設置 Redis 快取失敗: %s", e)
             return False
     
     async def delete(self, key: str) -> bool:
@@ -57,7 +99,7 @@ class RedisCache(BaseCache):
             return True
             
         except Exception as e:
-            self.logger.error(f"刪除 Redis 快取失敗: {str(e)}")
+            self.logger.error("刪除 Redis 快取失敗: %s", e)
             return False
     
     async def exists(self, key: str) -> bool:
@@ -67,7 +109,7 @@ class RedisCache(BaseCache):
             return await self.redis.exists(key) > 0
             
         except Exception as e:
-            self.logger.error(f"檢查 Redis 快取失敗: {str(e)}")
+            self.logger.error("檢查 Redis 快取失敗: %s", e)
             return False
     
     async def clear(self) -> bool:
@@ -77,9 +119,12 @@ class RedisCache(BaseCache):
             return True
             
         except Exception as e:
-            self.logger.error(f"清空 Redis 快取失敗: {str(e)}")
+            self.logger.error("清空 Redis 快取失敗: %s", e)
             return False
     
     async def close(self):
-        """關閉連接"""
-        await self.redis.close() 
\ No newline at end of file
+        """關閉連接（共用連接池保持開啟）"""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+            self._loop = None 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import aiohttp
 from .base import BaseMessageHandler
 from ..session import Message
@@ -11,6 +11,27 @@ class ImageMessageHandler(BaseMessageHandler):
     def __init__(self):
         super().__init__()
         self.supported_types = ["image"]
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """獲取共用的 HTTP 會話（延遲創建，重用連接）"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=8,
+                    keepalive_timeout=30,
+                    ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=60)
+            )
+        return self._session
+    
+    async def close(self):
+        """關閉 HTTP 會話"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def validate(self, message: Message) -> bool:
         """驗證圖片消息"""
@@ -24,10 +45,10 @@ class ImageMessageHandler(BaseMessageHandler):
         if message.media_url:
             try:
                 # 下載圖片
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(message.media_url) as response:
-                        if response.status == 200:
-                            message.content = await response.read()
+                session = await self._get_session()
+                async with session.get(message.media_url) as response:
+                    if response.status == 200:
+                        message.content = await response.read()
             except Exception as e:
                 logger.error(f"下載圖片失敗: {str(e)}")
                 raise
@@ -23,6 +23,17 @@ class MessageHandlerManager:
             raise TypeError("處理器必須繼承 BaseMessageHandler")
         self._handlers[message_type] = handler
     
+    async def close(self):
+        """關閉所有持有資源的處理器"""
+        for handler in self._handlers.values():
+            close = getattr(handler, "close", None)
+            if close is None:
+                continue
+            try:
+                await close()
+            except Exception as e:
+                logger.error("關閉處理器失敗: %s", e)
+    
     async def handle_message(self, message: Message) -> Dict:
         """處理消息"""
         try:
@@ -83,6 +83,10 @@ class ChatManager:
                 "error": str(e)
             }
     
+    async def close(self):
+        """關閉處理器持有的連接"""
+        await self.handlers.close()
+    
     async def cleanup_sessions(self):
         """清理過期會話"""
         try:
@@ -1,3 +1,4 @@
+import sys
 from typing import Dict, List, Optional
 from datetime import datetime
 from dataclasses import dataclass, field
@@ -13,6 +14,13 @@ class Message:
     timestamp: datetime = field(default_factory=datetime.now)
     type: str = "text"
     media_url: Optional[str] = None
+    
+    def __post_init__(self):
+        # 駐留角色和類型字符串，相同值共用同一對象
+        if type(self.role) is str:
+            self.role = sys.intern(self.role)
+        if type(self.type) is str:
+            self.type = sys.intern(self.type)
 
 @dataclass
 class Context:
@@ -1,9 +1,22 @@
+import string
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from ..session.base import Message
 
+@lru_cache(maxsize=256)
+def _parse_template(content: str) -> Tuple[Tuple[str, ...], str]:
+    """解析模板（按模板內容快取），返回變量名與純文本內容"""
+    parsed = list(string.Formatter().parse(content))
+    fields = tuple(
+        field_name for _, field_name, _, _ in parsed
+        if field_name is not None
+    )
+    literal = "".join(text for text, _, _, _ in parsed)
+    return fields, literal
+
 @dataclass
 class Prompt:
     """提示詞"""
@@ -18,10 +31,13 @@ class Prompt:
     def format(self, **kwargs) -> str:
         """格式化提示詞"""
         try:
-            # 合併默認變量和傳入的變量
-            variables = self.variables.copy()
-            variables.update(kwargs)
-            return self.content.format(**variables)
+            # 沒有變量的模板直接返回已解析的文本
+            fields, literal = _parse_template(self.content)
+            if not fields:
+                return literal
+            
+            # 傳入的變量優先於默認變量（普通字典查找比 ChainMap 快）
+            return self.content.format_map({**self.variables, **kwargs})
         except KeyError as e:
             raise PromptError(f"缺少必要的變量: {str(e)}")
         except Exception as e:
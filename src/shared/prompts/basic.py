@@ -1,26 +1,34 @@
-from typing import Dict, List, Optional
+import re
+from typing import Any, Dict, List, Optional
 from .base import BasePrompt, PromptContext
 
+# 匹配模板中的 {變數} 佔位符
+_VARIABLE_PATTERN = re.compile(r"\{(\w+)\}")
+
 class BasicPrompt(BasePrompt):
     """基本提示詞"""
     
     def format(self, context: PromptContext) -> str:
         """格式化提示詞"""
-        # 替換基本變數
-        prompt = self.template
-        base_vars = {
+        # 合併自定義變數和基本變數（基本變數優先），單次替換
+        variables = dict(context.variables or {})
+        variables.update({
             "user_id": context.user_id,
             "session_id": context.session_id,
             "language": context.language,
             "role": context.role
-        }
-        prompt = self._replace_variables(prompt, base_vars)
+        })
         
-        # 替換自定義變數
-        if context.variables:
-            prompt = self._replace_variables(prompt, context.variables)
-            
-        return prompt
+        return self._replace_variables(self.template, variables)
+    
+    @staticmethod
+    def _replace_variables(template: str, variables: Dict[str, Any]) -> str:
+        """替換變數（未知的佔位符保持不變）"""
+        return _VARIABLE_PATTERN.sub(
+            lambda m: str(variables[m.group(1)])
+            if m.group(1) in variables else m.group(0),
+            template
+        )
     
     def validate(self) -> bool:
         """驗證提示詞"""
@@ -1,22 +1,40 @@
+import asyncio
 import yaml
 from pathlib import Path
 from typing import Dict, List, Optional
 from .base import Prompt
 from ..utils.logger import logger
 
+# 優先使用 libyaml 的 C 實現
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 class PromptLoader:
     """提示詞加載器"""
     
     @staticmethod
     async def load_from_file(file_path: Path) -> List[Prompt]:
         """從文件加載提示詞"""
+        # 文件讀取和解析在線程池中執行，避免阻塞事件循環
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            PromptLoader._parse_file,
+            file_path
+        )
+    
+    @staticmethod
+    def _parse_file(file_path: Path) -> List[Prompt]:
+        """同步解析提示詞文件"""
         try:
             if not file_path.exists():
                 logger.error(f"提示詞文件不存在: {file_path}")
                 return []
             
             # 讀取 YAML 文件
-            data = yaml.safe_load(file_path.read_text())
+            data = yaml.load(file_path.read_bytes(), Loader=SafeLoader)
             if not isinstance(data, dict):
                 raise ValueError("無效的提示詞文件格式")
             
@@ -49,13 +67,15 @@ class PromptLoader:
         """從目錄加載提示詞"""
         prompts = []
         try:
-            # 遍歷目錄中的所有 YAML 文件
-            for file_path in directory.glob(pattern):
-                prompts.extend(
-                    await PromptLoader.load_from_file(file_path)
-                )
+            # 並行加載目錄中的所有 YAML 文件
+            results = await asyncio.gather(*(
+                PromptLoader.load_from_file(file_path)
+                for file_path in sorted(directory.glob(pattern))
+            ))
+            for file_prompts in results:
+                prompts.extend(file_prompts)
             return prompts
             
         except Exception as e:
             logger.error(f"加載提示詞目錄失敗: {str(e)}")
-            return prompts 
\ No newline at end of file
+            return prompts
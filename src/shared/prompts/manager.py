@@ -1,4 +1,5 @@
 import json
+import os
 from pathlib import Path
 from typing import Dict, Optional
 from .base import BasePrompt, PromptContext
@@ -88,13 +89,15 @@ class PromptManager:
             if not prompt or not prompt.validate():
                 return False
                 
-            # 保存到文件
+            # 保存到文件（先寫臨時文件再替換，避免寫入中斷留下損壞的文件）
             file_path = self.prompt_dir / f"{prompt_id}.json"
-            with open(file_path, "w", encoding="utf-8") as f:
+            tmp_path = file_path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
                 json.dump({
                     "type": prompt_type,
                     "template": template
                 }, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, file_path)
                 
             # 添加到內存
             self.prompts[prompt_id] = prompt
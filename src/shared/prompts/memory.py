@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional
+from itertools import chain, count
+from typing import Dict, List, Optional, Tuple
 from .base import BasePromptManager, Prompt
 from ..utils.logger import logger
 
@@ -7,6 +8,13 @@ class MemoryPromptManager(BasePromptManager):
     
     def __init__(self):
         self._prompts: Dict[str, Prompt] = {}
+        # 標籤索引: {tag: {name: None}}，保持插入順序
+        self._by_tag: Dict[str, Dict[str, None]] = {}
+        # 提示詞在索引中的標籤快照: {name: tags}，避免原地修改 tags 後無法移除
+        self._indexed_tags: Dict[str, Tuple[str, ...]] = {}
+        # 提示詞的保存順序: {name: 序號}，標籤查詢結果按此排序
+        self._order: Dict[str, int] = {}
+        self._counter = count()
     
     async def get_prompt(self, name: str) -> Optional[Prompt]:
         """獲取提示詞"""
@@ -15,7 +23,14 @@ class MemoryPromptManager(BasePromptManager):
     async def save_prompt(self, prompt: Prompt) -> bool:
         """保存提示詞"""
         try:
+            self._unindex(prompt.name)
+            if prompt.name not in self._prompts:
+                self._order[prompt.name] = next(self._counter)
             self._prompts[prompt.name] = prompt
+            tags = tuple(prompt.tags)
+            self._indexed_tags[prompt.name] = tags
+            for tag in tags:
+                self._by_tag.setdefault(tag, {})[prompt.name] = None
             logger.info(f"已保存提示詞: {prompt.name}")
             return True
         except Exception as e:
@@ -26,7 +41,9 @@ class MemoryPromptManager(BasePromptManager):
         """刪除提示詞"""
         try:
             if name in self._prompts:
+                self._unindex(name)
                 del self._prompts[name]
+                del self._order[name]
                 logger.info(f"已刪除提示詞: {name}")
                 return True
             return False
@@ -42,7 +59,19 @@ class MemoryPromptManager(BasePromptManager):
         if not tags:
             return list(self._prompts.values())
         
+        names = set(chain.from_iterable(
+            self._by_tag.get(tag, ()) for tag in tags
+        ))
         return [
-            prompt for prompt in self._prompts.values()
-            if any(tag in prompt.tags for tag in tags)
-        ] 
\ No newline at end of file
+            self._prompts[name]
+            for name in sorted(names, key=self._order.__getitem__)
+        ]
+    
+    def _unindex(self, name: str):
+        """從標籤索引中移除提示詞"""
+        for tag in self._indexed_tags.pop(name, ()):
+            names = self._by_tag.get(tag)
+            if names is not None:
+                names.pop(name, None)
+                if not names:
+                    del self._by_tag[tag] 
\ No newline at end of file
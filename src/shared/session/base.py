@@ -1,43 +1,100 @@
+import os
+import sys
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from collections import deque
+from typing import Deque, Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field
-from uuid import uuid4
+
+def generate_id() -> str:
+    """生成 128 位隨機十六進制 ID"""
+    return os.urandom(16).hex()
 
 @dataclass
 class Message:
     """會話消息"""
     role: str
     content: str
-    message_id: str = field(default_factory=lambda: str(uuid4()))
+    message_id: str = field(default_factory=generate_id)
     timestamp: datetime = field(default_factory=datetime.now)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _timestamp_iso: Optional[Tuple[datetime, str]] = field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False
+    )
     
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.now()
+        # 駐留角色字符串，相同角色共用同一對象
+        if type(self.role) is str:
+            self.role = sys.intern(self.role)
+    
+    @property
+    def timestamp_iso(self) -> str:
+        """ISO 格式時間戳（快取，時間戳變更時重新計算）"""
+        cached = self._timestamp_iso
+        if cached is None or cached[0] is not self.timestamp:
+            cached = self._timestamp_iso = (
+                self.timestamp,
+                self.timestamp.isoformat()
+            )
+        return cached[1]
     
     def to_dict(self) -> Dict:
         """轉換為字典"""
         return {
             "role": self.role,
             "content": self.content,
-            "timestamp": self.timestamp.isoformat()
+            "timestamp": self.timestamp_iso
         }
 
+def _bisect_timestamp(
+    messages: List[Message],
+    timestamp: datetime,
+    right: bool = False
+) -> int:
+    """在按時間排序的消息列表中二分查找時間戳位置"""
+    lo, hi = 0, len(messages)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        ts = messages[mid].timestamp
+        if ts < timestamp or (right and ts == timestamp):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
 @dataclass
 class Session:
     """會話"""
-    session_id: str = field(default_factory=lambda: str(uuid4()))
+    session_id: str = field(default_factory=generate_id)
     user_id: str = ""
     messages: List[Message] = field(default_factory=list)
     created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
+    updated_at: Optional[datetime] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
     
+    def __post_init__(self):
+        if self.updated_at is None:
+            self.updated_at = self.created_at
+        # get_messages 依賴按時間排序，傳入的消息可能無序
+        self.messages.sort(key=lambda message: message.timestamp)
+    
     def add_message(self, message: Message):
-        """添加消息"""
-        self.messages.append(message)
+        """添加消息（保持按時間排序）"""
+        if self.messages and message.timestamp < self.messages[-1].timestamp:
+            index = _bisect_timestamp(
+                self.messages,
+                message.timestamp,
+                right=True
+            )
+            self.messages.insert(index, message)
+        else:
+            self.messages.append(message)
         self.updated_at = datetime.now()
     
     def clear_messages(self):
@@ -51,18 +108,16 @@ class Session:
         before: Optional[datetime] = None
     ) -> List[Message]:
         """獲取消息"""
-        messages = self.messages
-        
-        if before:
-            messages = [
-                msg for msg in messages
-                if msg.timestamp < before
-            ]
+        if not before and not limit:
+            return self.messages
         
-        if limit:
-            messages = messages[-limit:]
-        
-        return messages
+        # 消息按時間排序，直接二分定位切片範圍
+        end = (
+            _bisect_timestamp(self.messages, before)
+            if before else len(self.messages)
+        )
+        start = max(end - limit, 0) if limit else 0
+        return self.messages[start:end]
 
 class BaseSessionManager(ABC):
     """會話管理器基類"""
@@ -111,6 +166,9 @@ class BaseSessionManager(ABC):
 class BaseSession(ABC):
     """會話基類"""
     
+    # 活動時間更新的最小間隔（秒）
+    activity_resolution: float = 1.0
+    
     def __init__(
         self,
         session_id: str,
@@ -120,10 +178,13 @@ class BaseSession(ABC):
         self.session_id = session_id
         self.user_id = user_id
         self.max_messages = max_messages
-        self.messages: List[Message] = []
+        # 超過 max_messages 時自動丟棄最舊的消息
+        self.messages: Deque[Message] = deque(maxlen=max_messages)
         self.metadata: Dict[str, Any] = {}
-        self.created_at = datetime.now()
-        self.last_active = datetime.now()
+        now = datetime.now()
+        self.created_at = now
+        self.last_active = now
+        self._activity_mono = time.monotonic()
     
     @abstractmethod
     async def add_message(self, message: Message) -> bool:
@@ -162,5 +223,8 @@ class BaseSession(ABC):
         return delta.total_seconds() > timeout
     
     def update_activity(self):
-        """更新活動時間"""
-        self.last_active = datetime.now() 
\ No newline at end of file
+        """更新活動時間（間隔小於 activity_resolution 時跳過）"""
+        now = time.monotonic()
+        if now - self._activity_mono >= self.activity_resolution:
+            self._activity_mono = now
+            self.last_active = datetime.now() 
\ No newline at end of file
@@ -24,11 +24,11 @@ class SessionManagerFactory:
                 )
             
             manager = manager_class()
-            logger.info(f"已創建會話管理器: {manager_type}")
+            logger.info("已創建會話管理器: %s", manager_type)
             return manager
             
         except Exception as e:
-            logger.error(f"創建會話管理器失敗: {str(e)}")
+            logger.error("創建會話管理器失敗: %s", e)
             # 默認使用記憶體管理器
             return MemorySessionManager()
     
@@ -40,4 +40,4 @@ class SessionManagerFactory:
     ):
         """註冊新的管理器類型"""
         cls._managers[manager_type] = manager_class
-        logger.info(f"已註冊新的會話管理器類型: {manager_type}") 
\ No newline at end of file
+        logger.info("已註冊新的會話管理器類型: %s", manager_type) 
\ No newline at end of file
@@ -1,4 +1,7 @@
-from typing import Dict, Optional
+import heapq
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from .base import BaseSession, Message
 from .memory import MemorySession
@@ -17,7 +20,11 @@ class SessionManager:
         self.session_timeout = session_timeout
         self.max_sessions = max_sessions
         self.max_messages = max_messages
-        self.sessions: Dict[str, BaseSession] = {}
+        # 按最近訪問順序排列，超出上限時淘汰最久未使用的會話
+        self.sessions: "OrderedDict[str, BaseSession]" = OrderedDict()
+        # 過期時間最小堆: [(過期時間戳, 會話ID)]，配合 _expiry_at 惰性失效
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._expiry_at: Dict[str, float] = {}
     
     async def get_session(
         self,
@@ -32,6 +39,7 @@ class SessionManager:
             if session and not session.is_expired(self.session_timeout):
                 if user_id and session.user_id != user_id:
                     return None
+                self.sessions.move_to_end(session_id)
                 return session
                 
             # 如果會話過期或不存在，且提供了用戶ID，創建新會話
@@ -41,7 +49,7 @@ class SessionManager:
             return None
             
         except Exception as e:
-            logger.error(f"獲取會話失敗: {str(e)}")
+            logger.error("獲取會話失敗: %s", e)
             return None
     
     async def create_session(
@@ -50,29 +58,26 @@ class SessionManager:
         session_id: Optional[str] = None
     ) -> BaseSession:
         """創建會話"""
-        try:
-            # 生成會話ID
-            session_id = session_id or generate_session_id(user_id)
-            
-            # 檢查會話數量限制
-            if len(self.sessions) >= self.max_sessions:
-                self._cleanup_expired_sessions()
-                
-            # 創建新會話
-            session = MemorySession(
-                session_id=session_id,
-                user_id=user_id,
-                max_messages=self.max_messages
-            )
-            
-            self.sessions[session_id] = session
-            logger.info(f"創建新會話: {session_id} (用戶: {user_id})")
-            
-            return session
+        # 生成會話ID
+        session_id = session_id or generate_session_id(user_id)
+        
+        # 檢查會話數量限制
+        if len(self.sessions) >= self.max_sessions:
+            self._cleanup_expired_sessions()
+            self._evict_sessions()
             
-        except Exception as e:
-            logger.error(f"創建會話失敗: {str(e)}")
-            return None
+        # 創建新會話
+        session = MemorySession(
+            session_id=session_id,
+            user_id=user_id,
+            max_messages=self.max_messages
+        )
+        
+        self.sessions[session_id] = session
+        self._schedule_expiry(session)
+        logger.info("創建新會話: %s (用戶: %s)", session_id, user_id)
+        
+        return session
     
     async def add_message(
         self,
@@ -90,31 +95,84 @@ class SessionManager:
             return await session.add_message(message)
             
         except Exception as e:
-            logger.error(f"添加消息失敗: {str(e)}")
+            logger.error("添加消息失敗: %s", e)
             return False
     
+    def _expiry_of(self, session: BaseSession) -> float:
+        """計算會話過期時間戳"""
+        return session.last_active.timestamp() + self.session_timeout
+    
+    def _schedule_expiry(self, session: BaseSession):
+        """將會話過期時間加入堆"""
+        if not self.session_timeout:
+            return
+        expiry = self._expiry_of(session)
+        self._expiry_at[session.session_id] = expiry
+        heapq.heappush(self._expiry_heap, (expiry, session.session_id))
+        self._compact_expiry_heap()
+    
+    def _compact_expiry_heap(self):
+        """舊項目超過有效項目時重建堆，避免堆無限增長"""
+        if len(self._expiry_heap) > 2 * len(self._expiry_at):
+            self._expiry_heap = [
+                (expiry, session_id)
+                for session_id, expiry in self._expiry_at.items()
+            ]
+            heapq.heapify(self._expiry_heap)
+    
     def _cleanup_expired_sessions(self):
         """清理過期會話"""
-        expired = [
-            sid for sid, session in self.sessions.items()
-            if session.is_expired(self.session_timeout)
-        ]
+        now = time.time()
+        expired = 0
         
-        for session_id in expired:
+        # 只彈出已到期的堆頂項目，無需掃描所有會話
+        while self._expiry_heap and self._expiry_heap[0][0] < now:
+            expiry, session_id = heapq.heappop(self._expiry_heap)
+            
+            # 跳過已被重新排程或已刪除會話的舊項目
+            if self._expiry_at.get(session_id) != expiry:
+                continue
+                
+            session = self.sessions.get(session_id)
+            if session is None:
+                del self._expiry_at[session_id]
+                continue
+            
+            # 會話期間有活動，按實際過期時間重新排程
+            if self._expiry_of(session) >= now:
+                self._schedule_expiry(session)
+                continue
+                
             del self.sessions[session_id]
+            del self._expiry_at[session_id]
+            expired += 1
             
         if expired:
-            logger.info(f"清理 {len(expired)} 個過期會話")
+            logger.info("清理 %s 個過期會話", expired)
+    
+    def _evict_sessions(self):
+        """淘汰最久未使用的會話，為新會話騰出空間"""
+        evicted = 0
+        while self.sessions and len(self.sessions) >= self.max_sessions:
+            session_id, _ = self.sessions.popitem(last=False)
+            self._expiry_at.pop(session_id, None)
+            evicted += 1
+            
+        self._compact_expiry_heap()
+        if evicted:
+            logger.info("淘汰 %s 個最久未使用的會話", evicted)
     
     async def close_session(self, session_id: str) -> bool:
         """關閉會話"""
         try:
             if session_id in self.sessions:
                 del self.sessions[session_id]
-                logger.info(f"關閉會話: {session_id}")
+                self._expiry_at.pop(session_id, None)
+                self._compact_expiry_heap()
+                logger.info("關閉會話: %s", session_id)
                 return True
             return False
             
         except Exception as e:
-            logger.error(f"關閉會話失敗: {str(e)}")
+            logger.error("關閉會話失敗: %s", e)
             return False 
\ No newline at end of file
@@ -1,6 +1,7 @@
+from itertools import islice
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-from .base import BaseSession, Message
+from .base import BaseSession, Message, generate_id
 from ..utils.logger import logger
 
 class MemorySession(BaseSession):
@@ -8,21 +9,12 @@ class MemorySession(BaseSession):
     
     async def add_message(self, message: Message) -> bool:
         """添加消息"""
-        try:
-            # 更新活動時間
-            self.update_activity()
-            
-            # 添加消息
-            self.messages.append(message)
-            
-            # 如果超過最大消息數，刪除最舊的消息
-            while len(self.messages) > self.max_messages:
-                self.messages.pop(0)
-                
-            return True
-            
-        except Exception:
-            return False
+        # 更新活動時間
+        self.update_activity()
+        
+        # 添加消息（deque 會自動丟棄超出上限的最舊消息）
+        self.messages.append(message)
+        return True
     
     async def get_messages(
         self,
@@ -31,28 +23,22 @@ class MemorySession(BaseSession):
         """獲取消息"""
         self.update_activity()
         
-        if limit is None or limit >= len(self.messages):
-            return self.messages.copy()
+        if not limit or limit >= len(self.messages):
+            return list(self.messages)
             
-        return self.messages[-limit:]
+        return list(islice(self.messages, len(self.messages) - limit, None))
     
     async def clear_messages(self) -> bool:
         """清空消息"""
-        try:
-            self.update_activity()
-            self.messages.clear()
-            return True
-        except Exception:
-            return False
+        self.update_activity()
+        self.messages.clear()
+        return True
     
     async def set_metadata(self, key: str, value: Any) -> bool:
         """設置元數據"""
-        try:
-            self.update_activity()
-            self.metadata[key] = value
-            return True
-        except Exception:
-            return False
+        self.update_activity()
+        self.metadata[key] = value
+        return True
     
     async def get_metadata(self, key: str) -> Optional[Any]:
         """獲取元數據"""
@@ -64,6 +50,10 @@ class MemorySessionManager:
     
     def __init__(self):
         self._sessions: Dict[str, MemorySession] = {}
+        # 用戶索引: {user_id: {session_id: None}}，保持插入順序
+        self._by_user: Dict[str, Dict[str, None]] = {}
+        # 會話在索引中對應的用戶: {session_id: user_id}
+        self._indexed_user: Dict[str, str] = {}
     
     async def get_session(
         self,
@@ -79,14 +69,13 @@ class MemorySessionManager:
     ) -> MemorySession:
         """創建會話"""
         session = MemorySession(
-            user_id=user_id,
-            metadata=metadata or {}
-        )
-        self._sessions[session.session_id] = session
-        logger.info(
-            f"已創建會話: {session.session_id} "
-            f"(用戶: {user_id})"
+            session_id=generate_id(),
+            user_id=user_id
         )
+        if metadata:
+            session.metadata.update(metadata)
+        self._add(session)
+        logger.info("已創建會話: %s (用戶: %s)", session.session_id, user_id)
         return session
     
     async def save_session(
@@ -95,14 +84,14 @@ class MemorySessionManager:
     ) -> bool:
         """保存會話"""
         try:
-            self._sessions[session.session_id] = session
+            self._add(session)
             logger.debug(
-                f"已保存會話: {session.session_id} "
-                f"(消息數: {len(session.messages)})"
+                "已保存會話: %s (消息數: %s)",
+                session.session_id, len(session.messages)
             )
             return True
         except Exception as e:
-            logger.error(f"保存會話失敗: {str(e)}")
+            logger.error("保存會話失敗: %s", e)
             return False
     
     async def delete_session(
@@ -112,12 +101,12 @@ class MemorySessionManager:
         """刪除會話"""
         try:
             if session_id in self._sessions:
-                del self._sessions[session_id]
-                logger.info(f"已刪除會話: {session_id}")
+                self._remove(session_id)
+                logger.info("已刪除會話: %s", session_id)
                 return True
             return False
         except Exception as e:
-            logger.error(f"刪除會話失敗: {str(e)}")
+            logger.error("刪除會話失敗: %s", e)
             return False
     
     async def list_sessions(
@@ -127,7 +116,25 @@ class MemorySessionManager:
         """列出會話"""
         if user_id:
             return [
-                session for session in self._sessions.values()
-                if session.user_id == user_id
+                self._sessions[session_id]
+                for session_id in self._by_user.get(user_id, ())
             ]
-        return list(self._sessions.values()) 
\ No newline at end of file
+        return list(self._sessions.values())
+    
+    def _add(self, session: MemorySession):
+        """存儲會話並更新用戶索引"""
+        session_id = session.session_id
+        if self._indexed_user.get(session_id, session.user_id) != session.user_id:
+            self._remove(session_id)
+        self._sessions[session_id] = session
+        self._indexed_user[session_id] = session.user_id
+        self._by_user.setdefault(session.user_id, {})[session_id] = None
+    
+    def _remove(self, session_id: str):
+        """移除會話並更新用戶索引"""
+        del self._sessions[session_id]
+        user_id = self._indexed_user.pop(session_id)
+        session_ids = self._by_user[user_id]
+        del session_ids[session_id]
+        if not session_ids:
+            del self._by_user[user_id] 
\ No newline at end of file
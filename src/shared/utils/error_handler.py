@@ -1,9 +1,25 @@
+import json
 from typing import Dict, Any, Optional
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from .exceptions import BaseError
 from .logger import logger
 
+# 未知錯誤的響應內容固定，預先序列化（格式與 JSONResponse.render 一致）
+_INTERNAL_ERROR_BODY = json.dumps(
+    {
+        "success": False,
+        "error": {
+            "code": "INTERNAL_ERROR",
+            "message": "內部服務錯誤"
+        }
+    },
+    ensure_ascii=False,
+    allow_nan=False,
+    indent=None,
+    separators=(",", ":")
+).encode("utf-8")
+
 class ErrorHandler:
     """錯誤處理器"""
     
@@ -11,28 +27,23 @@ class ErrorHandler:
     async def handle_error(
         request: Request,
         exc: Exception
-    ) -> JSONResponse:
+    ) -> Response:
         """處理異常"""
         if isinstance(exc, BaseError):
-            return await ErrorHandler._handle_known_error(exc)
+            return ErrorHandler._handle_known_error(exc)
         else:
-            return await ErrorHandler._handle_unknown_error(exc)
+            return ErrorHandler._handle_unknown_error(exc)
     
     @staticmethod
-    async def _handle_known_error(error: BaseError) -> JSONResponse:
+    def _handle_known_error(error: BaseError) -> JSONResponse:
         """處理已知錯誤"""
-        logger.error(f"已知錯誤: {error.code} - {error.message}")
-        
-        response_data = {
-            "success": False,
-            "error": {
-                "code": error.code,
-                "message": error.message
-            }
-        }
+        logger.error("已知錯誤: %s - %s", error.code, error.message)
         
-        if error.details:
-            response_data["error"]["details"] = error.details
+        response_data = ErrorHandler.format_error_response(
+            error.message,
+            code=error.code,
+            details=error.details
+        )
             
         return JSONResponse(
             status_code=error.status_code,
@@ -40,19 +51,14 @@ class ErrorHandler:
         )
     
     @staticmethod
-    async def _handle_unknown_error(error: Exception) -> JSONResponse:
+    def _handle_unknown_error(error: Exception) -> Response:
         """處理未知錯誤"""
-        logger.error(f"未知錯誤: {str(error)}", exc_info=True)
+        logger.error("未知錯誤: %s", error, exc_info=True)
         
-        return JSONResponse(
+        return Response(
+            content=_INTERNAL_ERROR_BODY,
             status_code=500,
-            content={
-                "success": False,
-                "error": {
-                    "code": "INTERNAL_ERROR",
-                    "message": "內部服務錯誤"
-                }
-            }
+            media_type="application/json"
         )
     
     @staticmethod
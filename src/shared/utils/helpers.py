@@ -1,21 +1,27 @@
 import json
-import hashlib
+import secrets
 import base64
+import mmap
+import os
 from typing import Any, Dict, Optional
 from datetime import datetime, timezone, date
 from pathlib import Path
 from uuid import UUID
 
+# 優先使用 orjson 的 C 實現
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def generate_session_id(user_id: str) -> str:
     """生成會話 ID"""
-    timestamp = datetime.now(timezone.utc).isoformat()
-    data = f"{user_id}:{timestamp}"
-    return f"sess_{hashlib.sha256(data.encode()).hexdigest()[:12]}"
+    return f"sess_{secrets.token_hex(16)}"
 
 def safe_json_loads(data: str) -> Dict:
     """安全的 JSON 解析"""
     try:
-        return json.loads(data)
+        return json_loads(data)
     except json.JSONDecodeError:
         return {}
 
@@ -33,7 +39,7 @@ def truncate_text(text: str, max_length: int = 100) -> str:
     """截斷文本"""
     if len(text) <= max_length:
         return text
-    return text[:max_length-3] + "..."
+    return f"{text[:max_length - 3]}..."
 
 def format_timestamp(timestamp: Optional[float] = None) -> str:
     """格式化時間戳"""
@@ -48,7 +54,11 @@ def encode_image_to_base64(image_path: Path) -> Optional[str]:
     """將圖片轉換為 base64"""
     try:
         with open(image_path, "rb") as f:
-            return base64.b64encode(f.read()).decode()
+            # 空文件無法 mmap
+            if os.fstat(f.fileno()).st_size == 0:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return base64.b64encode(mm).decode("ascii")
     except Exception:
         return None
 
@@ -59,26 +69,64 @@ def sanitize_filename(filename: str) -> str:
         filename = filename.replace(char, '_')
     return filename
 
+VALID_IMAGE_TYPES = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.webp'})
+
 def get_file_extension(filename: str) -> str:
-    """獲取文件擴展名"""
-    return Path(filename).suffix.lower()
+    """獲取文件擴展名（與 Path.suffix 規則一致）"""
+    # Path 會忽略結尾的分隔符與 "." 路徑段
+    filename = filename.rstrip("/")
+    while filename.endswith("/."):
+        filename = filename[:-2].rstrip("/")
+    name = filename[filename.rfind("/") + 1:]
+    index = name.rfind(".")
+    # 隱藏文件（如 .env）與以點結尾的名稱沒有擴展名
+    if 0 < index < len(name) - 1:
+        return name[index:].lower()
+    return ""
 
 def is_valid_image_type(file_extension: str) -> bool:
     """檢查是否為有效的圖片類型"""
-    valid_types = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
-    return file_extension.lower() in valid_types
+    return file_extension.lower() in VALID_IMAGE_TYPES
+
+def _json_default(obj: Any) -> Any:
+    """序列化非標準類型"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Path):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 class JSONEncoder(json.JSONEncoder):
     """自定義 JSON 編碼器"""
     
     def default(self, obj: Any) -> Any:
-        if isinstance(obj, (datetime, date)):
-            return obj.isoformat()
-        if isinstance(obj, UUID):
-            return str(obj)
-        if isinstance(obj, Path):
-            return str(obj)
-        return super().default(obj)
+        try:
+            return _json_default(obj)
+        except TypeError:
+            return super().default(obj)
+
+def json_loads(data) -> Any:
+    """解析 JSON（str 或 bytes）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(data: Any, indent: Optional[int] = None) -> bytes:
+    """序列化為 UTF-8 JSON"""
+    # orjson 只支援 2 格縮排
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_json_default, option=option)
+    return json.dumps(
+        data,
+        indent=indent,
+        ensure_ascii=False,
+        cls=JSONEncoder
+    ).encode("utf-8")
 
 class Helper:
     """工具類"""
@@ -92,7 +140,7 @@ class Helper:
         try:
             if not file_path.exists():
                 return default
-            return json.loads(file_path.read_text())
+            return json_loads(file_path.read_bytes())
         except Exception as e:
             from .logger import logger
             logger.error(f"載入 JSON 失敗: {str(e)}")
@@ -107,14 +155,7 @@ class Helper:
         """保存 JSON 文件"""
         try:
             file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.write_text(
-                json.dumps(
-                    data,
-                    indent=indent,
-                    ensure_ascii=False,
-                    cls=JSONEncoder
-                )
-            )
+            file_path.write_bytes(json_dumps(data, indent=indent))
             return True
         except Exception as e:
             from .logger import logger
@@ -129,21 +170,22 @@ class Helper:
     ) -> Dict:
         """合併字典"""
         result = dict1.copy()
+        # 以顯式堆疊代替遞迴，只複製需要合併的子字典
+        stack = [(result, dict2)]
         
-        for key, value in dict2.items():
-            if (
-                deep and
-                key in result and
-                isinstance(result[key], dict) and
-                isinstance(value, dict)
-            ):
-                result[key] = Helper.merge_dicts(
-                    result[key],
-                    value,
-                    deep=True
-                )
-            else:
-                result[key] = value
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                current = target.get(key)
+                if (
+                    deep and
+                    isinstance(current, dict) and
+                    isinstance(value, dict)
+                ):
+                    target[key] = current.copy()
+                    stack.append((target[key], value))
+                else:
+                    target[key] = value
         
         return result
     
@@ -156,4 +198,4 @@ class Helper:
         """截斷文本"""
         if len(text) <= max_length:
             return text
-        return text[:max_length - len(suffix)] + suffix 
\ No newline at end of file
+        return f"{text[:max_length - len(suffix)]}{suffix}" 
\ No newline at end of file
@@ -1,75 +1,137 @@
+import asyncio
+import atexit
 import logging
 import os
-from pathlib import Path
-from ..config.manager import config_manager
+import queue
 import sys
-from typing import Optional
-from logging.handlers import RotatingFileHandler
-from functools import wraps
-from time import time
-from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from functools import lru_cache, wraps
+from time import perf_counter_ns
 
-class LoggerConfig:
-    """日誌配置"""
+DEFAULT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+@lru_cache(maxsize=None)
+def _get_formatter(format: str = DEFAULT_FORMAT) -> logging.Formatter:
+    """取得格式化器，相同格式的處理器共用同一實例"""
+    return logging.Formatter(format)
+
+@lru_cache(maxsize=None)
+def _get_logger(name: str, format: str = DEFAULT_FORMAT) -> logging.Logger:
+    """取得日誌器，控制台處理器每個名稱只安裝一次"""
+    logger = logging.getLogger(name)
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(_get_formatter(format))
+    logger.addHandler(console_handler)
+    return logger
+
+@lru_cache(maxsize=None)
+def setup_logger(
+    name: str = "ai_assistant",
+    log_file: Optional[Path] = None,
+    level: Optional[str] = None,
+    format: Optional[str] = None
+) -> logging.Logger:
+    """設置日誌，相同參數重複呼叫直接返回同一實例"""
+    if level is None or format is None:
+        # 延遲載入，避免與配置模組循環導入
+        from ..config.manager import config_manager
+        log_config = config_manager.get_app_config().get("logging", {})
+        level = level or log_config.get("level", "INFO")
+        format = format or log_config.get("format", DEFAULT_FORMAT)
     
-    @staticmethod
-    def setup_logger(
-        name: str = "ai_assistant",
-        log_file: Optional[Path] = None
-    ) -> logging.Logger:
-        """設置日誌"""
-        # 載入配置
-        app_config = config_manager.get_app_config()
-        log_config = app_config.get("logging", {})
-        
-        # 創建日誌器
-        logger = logging.getLogger(name)
-        logger.setLevel(log_config.get("level", "INFO"))
-        
-        # 設置格式
-        formatter = logging.Formatter(
-            log_config.get(
-                "format",
-                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-            )
+    logger = _get_logger(name, format)
+    logger.setLevel(level)
+    
+    # 文件處理器
+    if log_file:
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.FileHandler(
+            log_file,
+            encoding='utf-8'
         )
+        file_handler.setFormatter(_get_formatter(format))
+        logger.addHandler(file_handler)
+    
+    return logger
+
+class _BufferedRotatingFileHandler(RotatingFileHandler):
+    """帶寫入緩衝的輪替文件處理器，由 _BatchingQueueListener 負責刷新"""
+    
+    buffer_size = 65536
+    
+    def __init__(self, filename, *args, encoding: Optional[str] = None, **kwargs):
+        # 明確使用 UTF-8，避免非 UTF-8 模式下編碼為 "locale" 而無法計算大小
+        super().__init__(filename, *args, encoding=encoding or "utf-8", **kwargs)
+        # 自行累計文件大小；父類以 seek/tell 判斷輪替會把緩衝刷出
+        self._size = (
+            os.path.getsize(self.baseFilename)
+            if os.path.exists(self.baseFilename) else 0
+        )
+    
+    def _open(self):
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=getattr(self, "errors", None)
+        )
+    
+    def shouldRollover(self, record) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes <= 0:
+            return False
         
-        # 控制台處理器
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
-        
-        # 文件處理器
-        if log_file:
-            log_file.parent.mkdir(parents=True, exist_ok=True)
-            file_handler = logging.FileHandler(
-                log_file,
-                encoding='utf-8'
-            )
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
-        
-        return logger
+        msg = self.format(record) + self.terminator
+        size = len(msg.encode(self.encoding, "replace"))
+        if self._size + size >= self.maxBytes:
+            # 本條記錄將寫入輪替後的新文件
+            self._size = size
+            return True
+        self._size += size
+        return False
+    
+    def flush(self):
+        # 每條記錄後不刷新，交給監聽器批量處理
+        pass
+    
+    def flush_buffer(self):
+        """將緩衝內容寫入文件"""
+        super().flush()
 
-# 創建全局日誌器
-logger = LoggerConfig.setup_logger()
+class _BatchingQueueListener(QueueListener):
+    """隊列清空時才刷新處理器，連續的日誌合併為少量寫入"""
+    
+    def dequeue(self, block: bool):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            self._flush_handlers()
+            return self.queue.get(block)
+    
+    def stop(self):
+        super().stop()
+        self._flush_handlers()
+    
+    def _flush_handlers(self):
+        for handler in self.handlers:
+            getattr(handler, "flush_buffer", handler.flush)()
 
-# 導出 logger 實例
-__all__ = ["logger"]
+class LoggerConfig:
+    """日誌配置"""
+    
+    setup_logger = staticmethod(setup_logger)
 
 class Logger:
     """自定義日誌類"""
     
     def __init__(self, name: str = "app"):
-        self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.INFO)
-        self._setup_console_handler()
-    
-    def _setup_console_handler(self):
-        """設置控制台處理器"""
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(self._get_formatter())
-        self.logger.addHandler(console_handler)
+        self.logger = setup_logger(name, level="INFO", format=DEFAULT_FORMAT)
+        # 背景隊列: [(隊列處理器, 監聽器)]
+        self._listeners: List[Tuple[QueueHandler, QueueListener]] = []
     
     def add_file_handler(
         self,
@@ -77,86 +139,143 @@ class Logger:
         level: str = "INFO",
         format: Optional[str] = None,
         max_bytes: int = 10_000_000,  # 10MB
-        backup_count: int = 5
+        backup_count: int = 5,
+        enqueue: bool = True
     ):
         """添加文件處理器"""
         try:
             # 創建日誌目錄
             log_file.parent.mkdir(parents=True, exist_ok=True)
             
-            # 設置處理器
-            file_handler = RotatingFileHandler(
+            # 設置處理器（隊列模式下由背景線程批量寫入）
+            handler_class = (
+                _BufferedRotatingFileHandler if enqueue else RotatingFileHandler
+            )
+            file_handler = handler_class(
                 str(log_file),
                 maxBytes=max_bytes,
                 backupCount=backup_count
             )
             file_handler.setLevel(getattr(logging, level.upper()))
             file_handler.setFormatter(self._get_formatter(format))
-            self.logger.addHandler(file_handler)
+            
+            if enqueue:
+                # 寫入與輪替檢查由背景線程完成，調用方只需入隊
+                self._enqueue(file_handler)
+            else:
+                self.logger.addHandler(file_handler)
             
         except Exception as e:
-            self.error(f"添加文件處理器失敗: {str(e)}")
+            self.error("添加文件處理器失敗: %s", e)
+    
+    def _enqueue(self, handler: logging.Handler):
+        """將處理器放到背景隊列"""
+        log_queue = queue.SimpleQueue()
+        listener = _BatchingQueueListener(
+            log_queue,
+            handler,
+            respect_handler_level=True
+        )
+        listener.start()
+        if not self._listeners:
+            atexit.register(self.close)
+        queue_handler = QueueHandler(log_queue)
+        self.logger.addHandler(queue_handler)
+        self._listeners.append((queue_handler, listener))
+    
+    def close(self):
+        """停止背景隊列並寫出剩餘日誌"""
+        while self._listeners:
+            queue_handler, listener = self._listeners.pop()
+            # 先移除隊列處理器，之後的日誌不再堆積在已停止的隊列中
+            self.logger.removeHandler(queue_handler)
+            listener.stop()
     
     def _get_formatter(self, format_str: Optional[str] = None) -> logging.Formatter:
         """獲取格式化器"""
-        default_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        return logging.Formatter(format_str or default_format)
+        return _get_formatter(format_str or DEFAULT_FORMAT)
     
-    def debug(self, message: str):
+    def isEnabledFor(self, level: int) -> bool:
+        """檢查級別是否啟用"""
+        return self.logger.isEnabledFor(level)
+    
+    def debug(self, message: str, *args, **kwargs):
         """調試日誌"""
-        self.logger.debug(message)
+        self.logger.debug(message, *args, **kwargs)
     
-    def info(self, message: str):
+    def info(self, message: str, *args, **kwargs):
         """信息日誌"""
-        self.logger.info(message)
+        self.logger.info(message, *args, **kwargs)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args, **kwargs):
         """警告日誌"""
-        self.logger.warning(message)
+        self.logger.warning(message, *args, **kwargs)
     
-    def error(self, message: str):
+    def error(self, message: str, *args, **kwargs):
         """錯誤日誌"""
-        self.logger.error(message)
+        self.logger.error(message, *args, **kwargs)
     
-    def critical(self, message: str):
+    def critical(self, message: str, *args, **kwargs):
         """嚴重錯誤日誌"""
-        self.logger.critical(message)
+        self.logger.critical(message, *args, **kwargs)
 
 def log_execution_time(logger: Logger):
-    """記錄執行時間的裝飾器"""
+    """記錄執行時間的裝飾器（INFO 未啟用時不計時）"""
     def decorator(func):
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs):
-            start_time = time()
-            try:
-                result = await func(*args, **kwargs)
-                execution_time = time() - start_time
-                logger.info(f"{func.__name__} 執行時間: {execution_time:.2f}秒")
-                return result
-            except Exception as e:
-                execution_time = time() - start_time
-                logger.error(
-                    f"{func.__name__} 執行失敗，耗時 {execution_time:.2f}秒: {str(e)}"
-                )
-                raise
+        # 只建立與函數類型對應的包裝器
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not logger.isEnabledFor(logging.INFO):
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        logger.error("%s 執行失敗: %s", func.__name__, e)
+                        raise
+            
+                start_time = perf_counter_ns()
+                try:
+                    result = await func(*args, **kwargs)
+                    execution_time = (perf_counter_ns() - start_time) / 1e9
+                    logger.info("%s 執行時間: %.2f秒", func.__name__, execution_time)
+                    return result
+                except Exception as e:
+                    execution_time = (perf_counter_ns() - start_time) / 1e9
+                    logger.error(
+                        "%s 執行失敗，耗時 %.2f秒: %s",
+                        func.__name__, execution_time, e
+                    )
+                    raise
+            
+            return async_wrapper
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            start_time = time()
+            if not logger.isEnabledFor(logging.INFO):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    logger.error("%s 執行失敗: %s", func.__name__, e)
+                    raise
+            
+            start_time = perf_counter_ns()
             try:
                 result = func(*args, **kwargs)
-                execution_time = time() - start_time
-                logger.info(f"{func.__name__} 執行時間: {execution_time:.2f}秒")
+                execution_time = (perf_counter_ns() - start_time) / 1e9
+                logger.info("%s 執行時間: %.2f秒", func.__name__, execution_time)
                 return result
             except Exception as e:
-                execution_time = time() - start_time
+                execution_time = (perf_counter_ns() - start_time) / 1e9
                 logger.error(
-                    f"{func.__name__} 執行失敗，耗時 {execution_time:.2f}秒: {str(e)}"
+                    "%s 執行失敗，耗時 %.2f秒: %s",
+                    func.__name__, execution_time, e
                 )
                 raise
         
-        return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+        return sync_wrapper
     return decorator
 
 # 創建全局日誌實例
-logger = Logger() 
\ No newline at end of file
+logger = Logger()
+
+__all__ = ["logger", "Logger", "LoggerConfig", "setup_logger", "log_execution_time"] 
\ No newline at end of file
@@ -1,31 +1,23 @@
 import os
-import sys
 import pytest
-from pathlib import Path
 from unittest.mock import Mock
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
-from src.shared.database.base import Base, Database
-from src.main import create_app
-from src.shared.config.config import Config
-from src.shared.database.models.user import User
-from src.shared.database.models.conversation import Conversation
+from sqlalchemy.pool import StaticPool
 from typing import Generator
 from fastapi.testclient import TestClient
 
-# 添加專案根目錄到 Python 路徑
-project_root = str(Path(__file__).parent.parent)
-sys.path.insert(0, project_root)
-
-# 設置測試環境變數
-os.environ['ENV'] = 'test'
-os.environ['APP_NAME'] = 'LINE AI Assistant Test'
-os.environ['DEBUG'] = 'true'
-os.environ['LINE_CHANNEL_SECRET'] = 'test_secret'
-os.environ['LINE_CHANNEL_ACCESS_TOKEN'] = 'test_token'
-os.environ['DATABASE_URL'] = 'sqlite:///test.db'
-os.environ['GOOGLE_API_KEY'] = 'test_key'
+# 測試環境變數
+TEST_ENV = {
+    'ENV': 'test',
+    'APP_NAME': 'LINE AI Assistant Test',
+    'DEBUG': 'true',
+    'LINE_CHANNEL_SECRET': 'test_secret',
+    'LINE_CHANNEL_ACCESS_TOKEN': 'test_token',
+    'DATABASE_URL': 'sqlite:///test.db',
+    'GOOGLE_API_KEY': 'test_key'
+}
 
 @pytest.fixture
 def mock_gemini_model():
@@ -42,25 +34,29 @@ def mock_session():
     return mock 
 
 def pytest_configure(config):
-    """配置測試環境"""
-    os.environ['ENV'] = 'test'
-    os.environ['APP_NAME'] = 'LINE AI Assistant Test'
-    os.environ['DEBUG'] = 'true'
-    os.environ['LINE_CHANNEL_SECRET'] = 'test_secret'
-    os.environ['LINE_CHANNEL_ACCESS_TOKEN'] = 'test_token'
+    """配置測試環境（在收集測試、導入應用模組之前執行）"""
+    os.environ.update(TEST_ENV)
 
 @pytest.fixture(scope="session")
 def test_app():
     """創建測試用的 FastAPI 應用程序"""
+    from src.main import create_app
     return create_app()
 
 @pytest.fixture(scope="session")
 def db_engine():
-    # Use SQLite for testing
-    engine = create_engine("sqlite:///test.db")
+    from src.shared.database.base import Base
+    from src.shared.database.models import conversation, user  # 註冊模型
+    
+    # 使用 SQLite 內存數據庫，StaticPool 讓所有連接共用同一個數據庫
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
     Base.metadata.create_all(bind=engine)
     yield engine
-    os.remove("./test.db")
+    engine.dispose()
 
 @pytest.fixture
 def db_session(db_engine) -> Generator[Session, None, None]:
@@ -71,6 +67,11 @@ def db_session(db_engine) -> Generator[Session, None, None]:
     finally:
         session.rollback()
         session.close()
+        # 引擎在整個測試會話共用，清空已提交的數據以隔離測試
+        from src.shared.database.base import Base
+        with db_engine.begin() as connection:
+            for table in reversed(Base.metadata.sorted_tables):
+                connection.execute(table.delete())
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_env():
@@ -84,12 +85,11 @@ def setup_test_env():
     }
     
     # 設置測試環境變量
-    os.environ['LINE_CHANNEL_SECRET'] = 'test_secret'
-    os.environ['LINE_CHANNEL_ACCESS_TOKEN'] = 'test_token'
-    os.environ['DATABASE_URL'] = 'sqlite:///test.db'
-    os.environ['GOOGLE_API_KEY'] = 'test_key'
+    for key in original_env:
+        os.environ[key] = TEST_ENV[key]
     
     # 重新加載配置
+    from src.shared.config.config import Config
     config = Config()
     config.reload()
     
@@ -108,6 +108,7 @@ def setup_test_env():
 @pytest.fixture
 def test_config():
     """配置測試夾具"""
+    from src.shared.config.config import Config
     config = Config()
     config.reload()  # 確保使用測試環境變量
     return config
@@ -115,6 +116,7 @@ def test_config():
 @pytest.fixture(scope="session")
 def test_db(test_config):
     """提供測試數據庫實例"""
+    from src.shared.database.base import Database
     database = Database(test_config.settings)
     database.init_db()
     return database
@@ -125,7 +127,8 @@ def test_line_client(test_config):
     from src.shared.line_sdk.client import LineClient
     return LineClient()
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_client(test_app):
-    """創建測試用的 HTTP 客戶端"""
-    return TestClient(test_app) 
\ No newline at end of file
+    """創建測試用的 HTTP 客戶端（整個測試會話共用，啟動事件只執行一次）"""
+    with TestClient(test_app) as client:
+        yield client 
\ No newline at end of file
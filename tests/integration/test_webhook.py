@@ -1,17 +1,16 @@
 import pytest
-from fastapi.testclient import TestClient
 from unittest.mock import Mock, patch
-from src.main import create_app
 from src.shared.config.manager import config_manager
 from src.line.handler import line_handler
 from src.shared.events.publisher import event_publisher
 from src.shared.session.factory import SessionManagerFactory
 
 @pytest.fixture
-def client():
-    """測試客戶端"""
-    app = create_app()
-    return TestClient(app)
+def mock_webhook_handle(monkeypatch):
+    """模擬 LINE webhook 處理器"""
+    mock_handle = Mock()
+    monkeypatch.setattr("linebot.WebhookHandler.handle", mock_handle)
+    return mock_handle
 
 @pytest.fixture
 def line_signature():
@@ -38,29 +37,28 @@ def webhook_body():
 
 @pytest.mark.asyncio
 async def test_webhook_flow(
-    client,
+    test_client,
+    mock_webhook_handle,
     line_signature,
     webhook_body
 ):
     """測試完整的 webhook 流程"""
-    # 模擬 LINE 簽名驗證
-    with patch("linebot.WebhookHandler.handle") as mock_handle:
-        # 發送 webhook 請求
-        response = client.post(
-            "/line/webhook",
-            json=webhook_body,
-            headers={"X-Line-Signature": line_signature}
-        )
-        
-        # 驗證回應
-        assert response.status_code == 200
-        assert response.json() == {"status": "success"}
-        
-        # 驗證處理器被調用
-        mock_handle.assert_called_once()
+    # 發送 webhook 請求（簽名驗證由 mock_webhook_handle 模擬）
+    response = test_client.post(
+        "/line/webhook",
+        json=webhook_body,
+        headers={"X-Line-Signature": line_signature}
+    )
+    
+    # 驗證回應
+    assert response.status_code == 200
+    assert response.json() == {"status": "success"}
+    
+    # 驗證處理器被調用
+    mock_webhook_handle.assert_called_once()
 
 @pytest.mark.asyncio
-async def test_event_handling(webhook_body):
+async def test_event_handling(webhook_body, mock_webhook_handle):
     """測試事件處理"""
     # 創建測試事件處理器
     test_events = []
@@ -70,19 +68,19 @@ async def test_event_handling(webhook_body):
             test_events.append(event)
             return True
     
-    # 註冊處理器
-    event_publisher.subscribe(
-        "message",
-        TestHandler()
-    )
+    # 註冊處理器（結束後取消訂閱，避免影響其他測試）
+    handler = TestHandler()
+    event_publisher.subscribe("message", handler)
     
     # 模擬事件處理
-    with patch("linebot.WebhookHandler.handle"):
+    try:
         await line_handler.handle_request(
             Mock(),
             str(webhook_body),
             "test_signature"
         )
+    finally:
+        event_publisher.unsubscribe("message", handler)
     
     # 驗證事件
     assert len(test_events) == 1
@@ -1,7 +1,8 @@
+import asyncio
 import pytest
 from datetime import timedelta
 from src.shared.cache.memory import MemoryCache
-from src.shared.cache.redis import RedisCache
+from src.shared.cache.redis import RedisCache, _get_pool, _pools, close_pools
 
 @pytest.fixture
 def memory_cache():
@@ -45,6 +46,32 @@ async def test_memory_cache_expiration(memory_cache):
     await asyncio.sleep(1.1)
     assert not await memory_cache.exists("test_key")
 
+@pytest.mark.asyncio
+async def test_memory_cache_max_size():
+    """測試記憶體快取容量上限"""
+    cache = MemoryCache(max_size=2)
+    await cache.set("a", 1)
+    await cache.set("b", 2)
+    
+    # 訪問 a 後，b 成為最久未使用
+    assert await cache.get("a") == 1
+    await cache.set("c", 3)
+    
+    assert await cache.get("b") is None
+    assert await cache.get("a") == 1
+    assert await cache.get("c") == 3
+
+@pytest.mark.asyncio
+async def test_memory_cache_purges_expired():
+    """測試寫入時移除未再讀取的過期項目"""
+    cache = MemoryCache()
+    await cache.set("old", 1, expire=1)
+    cache._cache[cache._format_key("old")] = (1, 0.5)  # 模擬已過期
+    await cache.set("new", 2)
+    
+    assert cache._format_key("old") not in cache._cache
+    assert await cache.get("new") == 2
+
 @pytest.mark.asyncio
 async def test_redis_cache_basic(redis_cache):
     """測試 Redis 快取基本操作"""
@@ -77,4 +104,22 @@ async def test_redis_cache_expiration(redis_cache):
     
     # 等待過期
     await asyncio.sleep(1.1)
-    assert not await redis_cache.exists("test_key") 
\ No newline at end of file
+    assert not await redis_cache.exists("test_key") 
+
+@pytest.mark.asyncio
+async def test_redis_pool_sharing():
+    """測試連接池按地址與連接數共用"""
+    url = "redis://localhost"
+    assert _get_pool(url, 8) is _get_pool(url, 8)
+    assert _get_pool(url, 8) is not _get_pool(url, 16)
+    assert _get_pool(url, 16).max_connections == 16
+    
+    await close_pools()
+    assert asyncio.get_running_loop() not in _pools
+
+def test_redis_pool_per_event_loop():
+    """測試不同事件循環使用各自的連接池"""
+    async def get_pool():
+        return _get_pool("redis://localhost", 8)
+    
+    assert asyncio.run(get_pool()) is not asyncio.run(get_pool())
@@ -1,5 +1,7 @@
+import asyncio
 import pytest
 from datetime import timedelta
+from typing import Optional
 from src.shared.cache.decorators import cache
 from src.shared.cache.manager import CacheManager, CacheType
 
@@ -81,6 +83,58 @@ async def test_cache_null_values(cache_manager, test_service):
     )
     assert result2 is None
 
+@pytest.mark.asyncio
+async def test_cache_single_flight(cache_manager):
+    """測試相同鍵的並發調用只執行一次"""
+    cache_instance = cache_manager.get_cache(CacheType.MEMORY)
+    calls = []
+    
+    class SlowService:
+        @cache(expire=60)
+        async def load(self, key: str) -> str:
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return f"value:{key}"
+    
+    service = SlowService()
+    results = await asyncio.gather(*[
+        service.load("test", cache_instance=cache_instance)
+        for _ in range(5)
+    ])
+    
+    assert results == ["value:test"] * 5
+    assert calls == ["test"]
+
+@pytest.mark.asyncio
+async def test_cache_single_flight_leader_cancelled(cache_manager):
+    """測試領頭調用被取消時，等待者不受影響"""
+    cache_instance = cache_manager.get_cache(CacheType.MEMORY)
+    calls = []
+    
+    class SlowService:
+        @cache(expire=60)
+        async def load(self, key: str) -> str:
+            calls.append(key)
+            await asyncio.sleep(0.05)
+            return f"value:{key}"
+    
+    service = SlowService()
+    leader = asyncio.create_task(
+        service.load("test", cache_instance=cache_instance)
+    )
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(
+        service.load("test", cache_instance=cache_instance)
+    )
+    await asyncio.sleep(0.01)
+    
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    
+    assert await follower == "value:test"
+    assert calls == ["test", "test"]
+
 @pytest.mark.asyncio
 async def test_cache_manager_types(cache_manager):
     """測試快取管理器類型"""
@@ -92,6 +146,18 @@ async def test_cache_manager_types(cache_manager):
     redis_cache = cache_manager.get_cache(CacheType.REDIS)
     assert redis_cache is not None
 
+@pytest.mark.asyncio
+async def test_cache_manager_memory_bounded(cache_manager):
+    """測試管理器創建的記憶體快取有容量上限"""
+    memory_cache = cache_manager.get_cache(CacheType.MEMORY)
+    assert memory_cache.max_size
+    
+    bounded = CacheManager().get_cache(CacheType.MEMORY, max_size=2)
+    for key in ("a", "b", "c"):
+        await bounded.set(key, key)
+    assert not await bounded.exists("a")
+    assert await bounded.get("c") == "c"
+
 @pytest.mark.asyncio
 async def test_cache_manager_cleanup(cache_manager):
     """測試快取管理器清理"""
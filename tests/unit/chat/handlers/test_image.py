@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, AsyncMock
 from src.shared.chat.handlers.image import ImageMessageHandler
 from src.shared.chat.session import Message
 from src.shared.ai.base import AIResponse, ModelType
@@ -40,12 +40,13 @@ async def test_image_processing(image_handler, image_message):
     )
     
     with patch('aiohttp.ClientSession') as mock_session, \
+         patch('aiohttp.TCPConnector'), \
          patch('src.shared.ai.factory.AIModelFactory.create') as mock_create:
         # 模擬圖片下載
         mock_get = Mock()
         mock_get.status = 200
         mock_get.read = Mock(return_value=b"image_data")
-        mock_session.return_value.__aenter__.return_value.get.return_value.__aenter__.return_value = mock_get
+        mock_session.return_value.get.return_value.__aenter__.return_value = mock_get
         
         # 模擬 AI 模型
         mock_model = Mock()
@@ -57,4 +58,23 @@ async def test_image_processing(image_handler, image_message):
         assert result["success"]
         assert result["response"] == "image description"
         assert result["model"] == "gemini"
-        assert result["tokens"] == 5 
\ No newline at end of file
+        assert result["tokens"] == 5 
+
+@pytest.mark.asyncio
+async def test_image_session_reused(image_handler, image_message):
+    """測試多次下載共用同一 HTTP 會話"""
+    with patch('aiohttp.ClientSession') as mock_session, \
+         patch('aiohttp.TCPConnector'):
+        mock_session.return_value.closed = False
+        mock_session.return_value.close = AsyncMock()
+        mock_get = Mock()
+        mock_get.status = 200
+        mock_get.read = AsyncMock(return_value=b"image_data")
+        mock_session.return_value.get.return_value.__aenter__.return_value = mock_get
+        
+        await image_handler.preprocess(image_message)
+        await image_handler.preprocess(image_message)
+        assert mock_session.call_count == 1
+        
+        await image_handler.close()
+        mock_session.return_value.close.assert_awaited_once()
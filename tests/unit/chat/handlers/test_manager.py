@@ -47,4 +47,21 @@ async def test_invalid_message_type(handler_manager):
     )
     result = await handler_manager.handle_message(invalid_message)
     assert not result["success"]
-    assert "error" in result 
\ No newline at end of file
+    assert "error" in result
+
+@pytest.mark.asyncio
+async def test_manager_close(handler_manager):
+    """測試關閉管理器時關閉處理器"""
+    closed = []
+    
+    class ClosableHandler(BaseMessageHandler):
+        async def handle(self, message):
+            return {"success": True}
+        async def validate(self, message):
+            return True
+        async def close(self):
+            closed.append(True)
+    
+    handler_manager.register_handler("closable", ClosableHandler())
+    await handler_manager.close()
+    assert closed == [True]
@@ -36,6 +36,12 @@ def test_prompt_formatting(prompt):
     with pytest.raises(PromptError):
         prompt.format(wrong_var="test")
 
+def test_prompt_formatting_without_variables():
+    """測試無變量提示詞格式化"""
+    prompt = Prompt(name="plain", content="Use {{braces}} literally")
+    assert prompt.format() == "Use {braces} literally"
+    assert prompt.format(unused="x") == "Use {braces} literally"
+
 @pytest.mark.asyncio
 async def test_prompt_manager(prompt_manager, prompt):
     """測試提示詞管理器"""
@@ -63,6 +69,58 @@ async def test_prompt_manager(prompt_manager, prompt):
     assert await prompt_manager.delete_prompt("test")
     assert await prompt_manager.get_prompt("test") is None
 
+@pytest.mark.asyncio
+async def test_prompt_manager_tag_index(prompt_manager, prompt):
+    """測試標籤索引"""
+    await prompt_manager.save_prompt(prompt)
+    await prompt_manager.save_prompt(Prompt(
+        name="other",
+        content="Bye",
+        tags=["greeting", "farewell"]
+    ))
+    
+    # 多個標籤匹配同一提示詞時不重複
+    prompts = await prompt_manager.list_prompts(tags=["test", "greeting"])
+    assert [p.name for p in prompts] == ["test", "other"]
+    
+    # 覆蓋保存時更新標籤
+    await prompt_manager.save_prompt(Prompt(
+        name="test",
+        content="Hi",
+        tags=["farewell"]
+    ))
+    prompts = await prompt_manager.list_prompts(tags=["test"])
+    assert len(prompts) == 0
+    prompts = await prompt_manager.list_prompts(tags=["farewell"])
+    assert {p.name for p in prompts} == {"test", "other"}
+    
+    # 刪除後從索引中移除
+    await prompt_manager.delete_prompt("other")
+    prompts = await prompt_manager.list_prompts(tags=["greeting"])
+    assert len(prompts) == 0
+
+@pytest.mark.asyncio
+async def test_prompt_manager_tag_index_in_place_edit(prompt_manager, prompt):
+    """測試原地修改標籤後重新保存"""
+    await prompt_manager.save_prompt(prompt)
+    prompt.tags = ["new"]
+    await prompt_manager.save_prompt(prompt)
+    
+    assert await prompt_manager.list_prompts(tags=["test"]) == []
+    prompts = await prompt_manager.list_prompts(tags=["new"])
+    assert [p.name for p in prompts] == ["test"]
+
+@pytest.mark.asyncio
+async def test_prompt_manager_tag_query_order(prompt_manager):
+    """測試標籤查詢結果按保存順序排列"""
+    for name, tags in [("a", ["t0"]), ("b", ["t2"]), ("c", ["t1"])]:
+        await prompt_manager.save_prompt(
+            Prompt(name=name, content=name, tags=tags)
+        )
+    
+    prompts = await prompt_manager.list_prompts(tags=["t1", "t2"])
+    assert [p.name for p in prompts] == ["b", "c"]
+
 @pytest.mark.asyncio
 async def test_message_formatting(prompt_manager):
     """測試消息格式化"""
@@ -1,8 +1,9 @@
 import pytest
 from datetime import datetime, timedelta
 from src.shared.session.base import Message, Session
-from src.shared.session.memory import MemorySessionManager
+from src.shared.session.memory import MemorySession, MemorySessionManager
 from src.shared.session.factory import SessionManagerFactory
+from src.shared.session.manager import SessionManager
 
 @pytest.fixture
 def message():
@@ -32,6 +33,15 @@ def test_message_creation(message):
     assert message.message_id is not None
     assert isinstance(message.timestamp, datetime)
 
+def test_message_to_dict(message):
+    """測試消息序列化"""
+    data = message.to_dict()
+    assert data["timestamp"] == message.timestamp.isoformat()
+    
+    # 時間戳變更後重新計算
+    message.timestamp = datetime(2024, 1, 1, 12, 0)
+    assert message.to_dict()["timestamp"] == "2024-01-01T12:00:00"
+
 def test_session_creation(session):
     """測試會話創建"""
     assert session.session_id is not None
@@ -76,6 +86,76 @@ def test_session_message_filtering(session):
     filtered = session.get_messages(before=cutoff)
     assert len(filtered) == 3
 
+def test_session_message_ordering(session):
+    """測試消息按時間排序"""
+    now = datetime.now()
+    for minutes in (0, 2, 4, 1):
+        session.add_message(Message(
+            role="user",
+            content=f"Message {minutes}",
+            timestamp=now + timedelta(minutes=minutes)
+        ))
+    
+    # 亂序消息插入到正確位置
+    assert [m.content for m in session.messages] == [
+        "Message 0", "Message 1", "Message 2", "Message 4"
+    ]
+    
+    # 時間過濾與數量限制組合
+    filtered = session.get_messages(
+        limit=2,
+        before=now + timedelta(minutes=3)
+    )
+    assert [m.content for m in filtered] == ["Message 1", "Message 2"]
+
+def test_session_initial_messages_sorted():
+    """測試創建會話時傳入的消息按時間排序"""
+    now = datetime.now()
+    session = Session(messages=[
+        Message(
+            role="user",
+            content=f"Message {minutes}",
+            timestamp=now + timedelta(minutes=minutes)
+        )
+        for minutes in (3, 0, 2)
+    ])
+    
+    filtered = session.get_messages(before=now + timedelta(minutes=1))
+    assert [m.content for m in filtered] == ["Message 0"]
+
+@pytest.mark.asyncio
+async def test_session_activity_throttling(message):
+    """測試活動時間更新節流"""
+    session = MemorySession("sess_test", "test_user")
+    last_active = session.last_active
+    
+    # 間隔內不更新活動時間
+    await session.add_message(message)
+    assert session.last_active is last_active
+    
+    # 超過間隔後更新
+    session.activity_resolution = 0
+    await session.add_message(message)
+    assert session.last_active >= last_active
+    assert session.last_active is not last_active
+
+@pytest.mark.asyncio
+async def test_memory_session_message_limit():
+    """測試記憶體會話消息上限"""
+    session = MemorySession("sess_test", "test_user", max_messages=3)
+    for i in range(5):
+        assert await session.add_message(
+            Message(role="user", content=f"Message {i}")
+        )
+    
+    messages = await session.get_messages()
+    assert [m.content for m in messages] == [
+        "Message 2", "Message 3", "Message 4"
+    ]
+    
+    messages = await session.get_messages(limit=2)
+    assert [m.content for m in messages] == ["Message 3", "Message 4"]
+
 @pytest.mark.asyncio
 async def test_session_manager(session_manager):
     """測試會話管理器"""
@@ -109,6 +189,29 @@ async def test_session_manager(session_manager):
     assert await session_manager.delete_session(session.session_id)
     assert await session_manager.get_session(session.session_id) is None
 
+@pytest.mark.asyncio
+async def test_session_manager_user_index(session_manager):
+    """測試按用戶索引會話"""
+    first = await session_manager.create_session("user1")
+    second = await session_manager.create_session("user1")
+    other = await session_manager.create_session("user2")
+    
+    sessions = await session_manager.list_sessions("user1")
+    assert [s.session_id for s in sessions] == [
+        first.session_id, second.session_id
+    ]
+    
+    # 刪除後從索引中移除
+    assert await session_manager.delete_session(first.session_id)
+    sessions = await session_manager.list_sessions("user1")
+    assert [s.session_id for s in sessions] == [second.session_id]
+    
+    # 保存時用戶變更會更新索引
+    other.user_id = "user1"
+    assert await session_manager.save_session(other)
+    assert await session_manager.list_sessions("user2") == []
+    assert len(await session_manager.list_sessions("user1")) == 2
+
 def test_session_manager_factory():
     """測試會話管理器工廠"""
     # 創建默認管理器
@@ -121,4 +224,55 @@ def test_session_manager_factory():
     
     # 測試無效類型
     manager = SessionManagerFactory.create_manager("invalid")
-    assert isinstance(manager, MemorySessionManager) 
\ No newline at end of file
+    assert isinstance(manager, MemorySessionManager)
+
+@pytest.mark.asyncio
+async def test_session_manager_cleanup_expired():
+    """測試過期會話清理"""
+    manager = SessionManager(session_timeout=60)
+    expired = await manager.create_session("user1", "sess_expired")
+    await manager.create_session("user2", "sess_active")
+    refreshed = await manager.create_session("user3", "sess_refreshed")
+    
+    # 模擬會話過期，並重新排程其中一個
+    expired.last_active = datetime.now() - timedelta(minutes=5)
+    refreshed.last_active = datetime.now() - timedelta(minutes=5)
+    manager._schedule_expiry(expired)
+    manager._schedule_expiry(refreshed)
+    refreshed.last_active = datetime.now()
+    
+    manager._cleanup_expired_sessions()
+    assert "sess_expired" not in manager.sessions
+    assert "sess_active" in manager.sessions
+    assert "sess_refreshed" in manager.sessions
+    
+    # 已關閉會話的舊堆項目會被忽略
+    assert await manager.close_session("sess_active")
+    manager._cleanup_expired_sessions()
+    assert "sess_refreshed" in manager.sessions
+
+@pytest.mark.asyncio
+async def test_session_manager_expiry_heap_bounded():
+    """測試創建並關閉會話後過期堆不會無限增長"""
+    manager = SessionManager()
+    await manager.create_session("user0", "sess_kept")
+    
+    for i in range(1000):
+        await manager.create_session(f"user{i}", f"sess_{i}")
+        assert await manager.close_session(f"sess_{i}")
+    
+    assert list(manager.sessions) == ["sess_kept"]
+    assert len(manager._expiry_heap) <= 2 * len(manager.sessions)
+
+@pytest.mark.asyncio
+async def test_session_manager_lru_eviction():
+    """測試超過會話上限時淘汰最久未使用的會話"""
+    manager = SessionManager(max_sessions=2)
+    await manager.create_session("user1", "sess_1")
+    await manager.create_session("user2", "sess_2")
+    
+    # 訪問 sess_1 後，sess_2 成為最久未使用
+    assert await manager.get_session("sess_1") is not None
+    await manager.create_session("user3", "sess_3")
+    
+    assert list(manager.sessions) == ["sess_1", "sess_3"]
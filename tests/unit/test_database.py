@@ -1,26 +1,12 @@
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from src.shared.database.base import Base
+from sqlalchemy.orm import Session
 from src.shared.database.models.user import User
 from src.shared.database.models.conversation import Conversation
 
 @pytest.fixture
-def session():
-    # 使用 SQLite 內存數據庫進行測試
-    engine = create_engine('sqlite:///:memory:', echo=True)
-    SessionLocal = sessionmaker(bind=engine)
-    
-    # 創建所有表
-    Base.metadata.create_all(bind=engine)
-    
-    # 提供會話
-    session = SessionLocal()
-    try:
-        yield session
-    finally:
-        session.close()
-        Base.metadata.drop_all(bind=engine)
+def session(db_session):
+    # 共用 conftest 中整個測試會話的內存數據庫
+    return db_session
 
 def test_create_user(session: Session):
     user = User(
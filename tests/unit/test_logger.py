@@ -1,8 +1,13 @@
 import pytest
 import logging
+import logging.handlers
 import os
 from pathlib import Path
-from src.shared.utils.logger import setup_logger
+from src.shared.utils.logger import (
+    Logger,
+    setup_logger,
+    _BufferedRotatingFileHandler
+)
 from src.shared.config.config import config
 
 @pytest.fixture
@@ -93,4 +98,88 @@ def test_logger_multiple_initialization():
     # 應該是同一個日誌記錄器實例
     assert logger1 is logger2
     # 處理器數量應該保持不變
-    assert len(logger2.handlers) == handlers_count
\ No newline at end of file
+    assert len(logger2.handlers) == handlers_count
+
+def test_logger_enqueued_file_handler(temp_log_dir):
+    """測試背景隊列文件處理器"""
+    log_file = temp_log_dir / "queued.log"
+    logger = Logger("test_enqueue")
+    logger.add_file_handler(log_file)
+    
+    logger.info("隊列消息 %s", 1)
+    logger.close()
+    
+    assert "隊列消息 1" in log_file.read_text()
+    
+    # 關閉後隊列處理器已移除
+    assert not any(
+        isinstance(h, logging.handlers.QueueHandler)
+        for h in logger.logger.handlers
+    )
+
+def test_buffered_file_handler_defers_writes(temp_log_dir):
+    """測試緩衝文件處理器在刷新前不寫入文件"""
+    log_file = temp_log_dir / "buffered.log"
+    handler = _BufferedRotatingFileHandler(
+        str(log_file),
+        maxBytes=10_000_000,
+        backupCount=1
+    )
+    record_logger = logging.getLogger("test_buffered")
+    record_logger.propagate = False
+    record_logger.addHandler(handler)
+    try:
+        for i in range(100):
+            record_logger.warning("緩衝消息 %d", i)
+        
+        # 輪替檢查不應把緩衝刷出
+        assert log_file.stat().st_size == 0
+        
+        handler.flush_buffer()
+        content = log_file.read_text()
+        assert "緩衝消息 0" in content and "緩衝消息 99" in content
+    finally:
+        record_logger.removeHandler(handler)
+        handler.close()
+
+def test_buffered_file_handler_rollover(temp_log_dir):
+    """測試緩衝文件處理器依累計大小輪替"""
+    log_file = temp_log_dir / "rollover.log"
+    handler = _BufferedRotatingFileHandler(
+        str(log_file),
+        maxBytes=200,
+        backupCount=1
+    )
+    record_logger = logging.getLogger("test_buffered_rollover")
+    record_logger.propagate = False
+    record_logger.addHandler(handler)
+    try:
+        for i in range(20):
+            record_logger.warning("輪替消息 %d", i)
+        handler.flush_buffer()
+        
+        assert (temp_log_dir / "rollover.log.1").exists()
+        assert log_file.stat().st_size < 200
+    finally:
+        record_logger.removeHandler(handler)
+        handler.close()
+
+def test_buffered_file_handler_encoding(temp_log_dir):
+    """測試緩衝文件處理器不依賴系統編碼"""
+    log_file = temp_log_dir / "encoding.log"
+    handler = _BufferedRotatingFileHandler(
+        str(log_file),
+        maxBytes=10_000_000,
+        backupCount=1
+    )
+    assert handler.encoding == "utf-8"
+    
+    record = logging.LogRecord(
+        "test_encoding", logging.WARNING, __file__, 0, "編碼消息", None, None
+    )
+    try:
+        handler.handle(record)
+        handler.flush_buffer()
+        assert "編碼消息" in log_file.read_text(encoding="utf-8")
+    finally:
+        handler.close()
@@ -1,28 +1,19 @@
-import pytest
-from fastapi.testclient import TestClient
-from src.main import create_app
 from src.shared.config.manager import config_manager
 
-@pytest.fixture
-def client():
-    """測試客戶端"""
-    app = create_app()
-    return TestClient(app)
-
-def test_line_health_check(client):
+def test_line_health_check(test_client):
     """測試 LINE 健康檢查"""
-    response = client.get("/line/health")
+    response = test_client.get("/line/health")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
 
-def test_line_webhook_without_signature(client):
+def test_line_webhook_without_signature(test_client):
     """測試沒有簽名的 webhook"""
-    response = client.post("/line/webhook")
+    response = test_client.post("/line/webhook")
     assert response.status_code == 422  # FastAPI 的驗證錯誤
 
-def test_line_webhook_with_invalid_signature(client):
+def test_line_webhook_with_invalid_signature(test_client):
     """測試無效簽名的 webhook"""
-    response = client.post(
+    response = test_client.post(
         "/line/webhook",
         headers={"X-Line-Signature": "invalid"},
         json={"events": []}
@@ -30,9 +21,9 @@ def test_line_webhook_with_invalid_signature(client):
     assert response.status_code == 200
     assert response.json() == {"status": "error"}
 
-def test_cors_configuration(client):
+def test_cors_configuration(test_client):
     """測試 CORS 配置"""
-    response = client.options(
+    response = test_client.options(
         "/line/health",
         headers={
             "Origin": "http://localhost",
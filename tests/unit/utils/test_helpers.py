@@ -6,6 +6,7 @@ from src.shared.utils.helpers import (
     truncate_text,
     calculate_text_tokens,
     sanitize_filename,
+    get_file_extension,
     is_valid_image_type
 )
 
@@ -13,7 +14,7 @@ def test_session_id_generation():
     """測試會話 ID 生成"""
     session_id = generate_session_id("user123")
     assert session_id.startswith("sess_")
-    assert len(session_id) == 17  # "sess_" + 12 chars
+    assert len(session_id) == 37  # "sess_" + 32 chars
 
 def test_safe_json_loads():
     """測試安全 JSON 解析"""
@@ -43,6 +44,14 @@ def test_sanitize_filename():
     assert ':' not in sanitized
     assert '*' not in sanitized
 
+def test_get_file_extension():
+    """測試擴展名與 Path.suffix 一致"""
+    for filename in [
+        "photo.JPG", "archive.tar.gz", ".env", "name.", "no_ext",
+        "dir.d/file", "a/b.png/", "dir.d/", "a.png/.", ""
+    ]:
+        assert get_file_extension(filename) == Path(filename).suffix.lower()
+
 def test_valid_image_types():
     """測試圖片類型驗證"""
     assert is_valid_image_type('.jpg')